@@ -1,6 +1,7 @@
 import argparse
 import base64
 import dataclasses
+import functools
 import hashlib
 import json
 import logging
@@ -9,6 +10,7 @@ import re
 import shutil
 import subprocess
 import sys
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from enum import StrEnum
@@ -17,16 +19,25 @@ from pathlib import Path
 from typing import Any, List
 from urllib.parse import ParseResult, urlparse
 
+import google_crc32c
 import requests
 import sentry_sdk
-from google.cloud.storage import Blob, Bucket
+from google.cloud.exceptions import NotFound, PreconditionFailed
+from google.cloud.storage import Blob, Bucket, Client, transfer_manager
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
-HASH_BLOCK_SIZE = 2**16
-
 MiB = 1024 * 1024
 
+# files larger than this threshold are uploaded in chunks that are transferred concurrently
+PARALLEL_UPLOAD_THRESHOLD = int(os.environ.get("SYMX_PARALLEL_UPLOAD_THRESHOLD_MIB", 200)) * MiB
+PARALLEL_UPLOAD_CHUNK_SIZE = 64 * MiB
+PARALLEL_UPLOAD_MAX_WORKERS = 8
+
+# the default requests pool keeps only 10 connections per host, which is less than our concurrent transfers need
+GCS_HTTP_POOL_SIZE = 64
+
 
 class Arch(StrEnum):
     ARM64E = "arm64e"
@@ -80,7 +91,7 @@ class ArtifactProcessingState(StrEnum):
     IGNORED = "ignored"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Device:
     product: str
     model: str
@@ -100,7 +111,9 @@ class Device:
 class DataClassJSONEncoder(json.JSONEncoder):
     def default(self, o: Any) -> Any:
         if dataclasses.is_dataclass(o):
-            return dataclasses.asdict(o)
+            # asdict() recursively deep-copies every field; a shallow mapping is enough since the encoder calls us again
+            # for any nested dataclass.
+            return {field.name: getattr(o, field.name) for field in dataclasses.fields(o)}
         return super().default(o)
 
 
@@ -111,6 +124,7 @@ def directory_arg_type(path: str) -> Path:
     raise ValueError(f"Error: {path} is not a valid directory")
 
 
+@functools.cache
 def ipsw_version() -> str:
     result = subprocess.run(["ipsw", "version"], capture_output=True, check=True)
     output = result.stdout.decode("utf-8")
@@ -173,28 +187,42 @@ def ipsw_device_list() -> list[Device]:
     return device_list
 
 
+# the run id doesn't change during a run, but we query it for every processed artifact
+@functools.cache
 def github_run_id() -> int:
     return int(os.getenv("GITHUB_RUN_ID", 0))
 
 
-def check_sha1(hash_sum: str, filepath: Path) -> bool:
-    sha1sum = hashlib.sha1()
-    with open(filepath, "rb") as f:
-        block = f.read(HASH_BLOCK_SIZE)
-        while len(block) != 0:
-            sha1sum.update(block)
-            block = f.read(HASH_BLOCK_SIZE)
-
-    sha1sum_result = sha1sum.hexdigest()
+def check_sha1(hash_sum: str, filepath: Path, sha1_digest: str | None = None) -> bool:
+    if sha1_digest is not None:
+        # the digest was already calculated while downloading, no need to read the file again
+        sha1sum_result = sha1_digest
+    else:
+        # file_digest() runs the read/update loop in C and releases the GIL while hashing
+        with open(filepath, "rb") as f:
+            sha1sum_result = hashlib.file_digest(f, "sha1").hexdigest()
     logger.debug(f"Calculated sha1 = {sha1sum_result}, expected sha1 = {hash_sum}")
     return sha1sum_result == hash_sum
 
 
-def try_download_url_to_file(url: str, filepath: Path, num_retries: int = 5) -> None:
+_download_sessions = threading.local()
+
+
+def download_session() -> requests.Session:
+    # reusing a session keeps connections alive, so consecutive downloads from the same host skip the TCP/TLS handshake.
+    # requests doesn't guarantee that a Session is thread-safe, so every thread (e.g. OTA mirror workers) gets its own.
+    session: requests.Session | None = getattr(_download_sessions, "session", None)
+    if session is None:
+        session = requests.Session()
+        _download_sessions.session = session
+    return session
+
+
+def try_download_url_to_file(url: str, filepath: Path, num_retries: int = 5) -> str | None:
+    resume = False
     while num_retries > 0:
         try:
-            download_url_to_file(url, filepath)
-            break
+            return download_url_to_file(url, filepath, resume)
         except Exception as e:
             if num_retries > 0:
                 num_retries = num_retries - 1
@@ -202,9 +230,46 @@ def try_download_url_to_file(url: str, filepath: Path, num_retries: int = 5) ->
                 sentry_sdk.capture_exception(e)
                 logger.warning(f"Failed to download URL {url} after {num_retries} retries: {e}")
 
+            # retries continue where the failed attempt stopped instead of downloading the whole file again
+            resume = True
+
+    return None
+
+
+def download_url_to_file(url: str, filepath: Path, resume: bool = False) -> str:
+    """
+    Streams the response of the given URL into a file and hashes the content as it passes through, so we don't have to
+    read the (multi-GB) file again to verify the download.
+    :param resume: request only the bytes missing from a partial download at `filepath` and append them
+    :return: the SHA1 hex-digest of the downloaded content
+    """
+    offset = 0
+    headers: dict[str, str] = {}
+    if resume and filepath.is_file():
+        offset = filepath.stat().st_size
+        headers["Range"] = f"bytes={offset}-"
+
+    res = download_session().get(url, stream=True, headers=headers)
+    if offset > 0 and res.status_code == requests.codes.requested_range_not_satisfiable:
+        # the previous attempt already received every byte (only its completion failed), so we just hash what we have
+        logger.debug(f"Download already complete at {floor(offset / MiB)} MiB")
+        with open(filepath, "rb") as f:
+            return hashlib.file_digest(f, "sha1").hexdigest()
+
+    # fail the attempt on error responses (instead of writing them to the file), so the retry resumes the download
+    res.raise_for_status()
+    if offset > 0 and res.status_code == requests.codes.partial_content:
+        logger.debug(f"Resuming download at {floor(offset / MiB)} MiB")
+        # the digest must cover the whole file, so we hash the bytes we already have before appending the rest
+        with open(filepath, "rb") as f:
+            sha1sum = hashlib.file_digest(f, "sha1")
+        mode = "ab"
+    else:
+        # either a fresh download or the server ignored the range: start from the beginning
+        offset = 0
+        sha1sum = hashlib.sha1()
+        mode = "wb"
 
-def download_url_to_file(url: str, filepath: Path) -> None:
-    res = requests.get(url, stream=True)
     content_length = res.headers.get("content-length")
     if not content_length:
         logger.warning("URL endpoint does not respond with a content-length header")
@@ -213,12 +278,14 @@ def download_url_to_file(url: str, filepath: Path) -> None:
         total_mib = total / MiB
         logger.debug(f"Filesize: {floor(total_mib)} MiB")
 
-    with open(filepath, "wb") as f:
-        actual = 0
+    with open(filepath, mode) as f:
+        actual = offset
         last_print = 0.0
         actual_mib = actual / MiB
-        for chunk in res.iter_content(chunk_size=8192):
+        # large chunks keep the per-chunk overhead of the Python loop (write, hash, progress) negligible
+        for chunk in res.iter_content(chunk_size=MiB):
             f.write(chunk)
+            sha1sum.update(chunk)
             actual = actual + len(chunk)
 
             actual_mib = actual / MiB
@@ -228,23 +295,35 @@ def download_url_to_file(url: str, filepath: Path) -> None:
 
         logger.debug(f"{floor(actual_mib)} MiB")
 
+    return sha1sum.hexdigest()
 
-def compare_md5_hash(local_file: Path, remote_blob: Blob) -> bool:
+
+def compare_file_hash(local_file: Path, remote_blob: Blob) -> bool:
     """
-    Reads the remote md5 meta from the blob and compares it with the md5 of the local file.
+    Reads the remote hash meta from the blob and compares it with the hash of the local file. GCS stores a CRC32C for
+    every object, while MD5 hashes are missing for composite or multipart uploads. CRC32C is also much cheaper to
+    compute (the C extension uses the SSE4.2/ARMv8 CRC instructions), so MD5 is only the fallback for blobs without
+    CRC32C.
     :param local_file: a Path to the local file
     :param remote_blob: a loaded (!) GCS bucket blob
     :return: True if the hashes are equal, otherwise False
     """
     remote_blob.reload()
-    remote_hash = remote_blob.md5_hash
-    local_hash = _fs_md5_hash(local_file)
+    if remote_blob.crc32c is not None:
+        hash_name = "CRC32C"
+        remote_hash = remote_blob.crc32c
+        local_hash = _fs_crc32c_hash(local_file)
+    else:
+        hash_name = "MD5"
+        remote_hash = remote_blob.md5_hash
+        local_hash = _fs_md5_hash(local_file)
+
     if remote_hash == local_hash:
-        logger.info(f'"{remote_blob.name}" was already uploaded with matching MD5 hash.')
+        logger.info(f'"{remote_blob.name}" was already uploaded with matching {hash_name} hash.')
         return True
     else:
         logger.error(
-            f'"{remote_blob.name}" was already uploaded but MD5 hash differs from the'
+            f'"{remote_blob.name}" was already uploaded but {hash_name} hash differs from the'
             f" one uploaded (remote = {remote_hash}, local = {local_hash}). "
         )
         return False
@@ -252,22 +331,85 @@ def compare_md5_hash(local_file: Path, remote_blob: Blob) -> bool:
 
 def _fs_md5_hash(file_path: Path) -> str:
     """
-    GCS only stores the MD5 hash of each uploaded file, so we can't use SHA1 to compare (as we do with the meta-data
-    since that is what we get from Apple to compare). Since it is still nice to quickly compare remote files without
-    download we also have a local md5-hasher here.
+    GCS only stores the CRC32C and MD5 hashes of each uploaded file, so we can't use SHA1 to compare (as we do with the
+    meta-data since that is what we get from Apple to compare). Since it is still nice to quickly compare remote files
+    without download we also have a local md5-hasher here.
     :param file_path:
     :return:
     """
-    hash_md5 = hashlib.md5()
     with open(file_path, "rb") as f:
-        block = f.read(HASH_BLOCK_SIZE)
-        while len(block) != 0:
-            hash_md5.update(block)
-            block = f.read(HASH_BLOCK_SIZE)
+        hash_md5 = hashlib.file_digest(f, "md5")
 
     return base64.b64encode(hash_md5.digest()).decode()
 
 
+def _fs_crc32c_hash(file_path: Path) -> str:
+    """
+    The CRC32C counterpart to _fs_md5_hash(). CRC32C is fast enough that the Python loop would dominate with small
+    blocks, so we read in larger ones.
+    :param file_path:
+    :return: the base64-encoded big-endian CRC32C as GCS reports it
+    """
+    checksum = google_crc32c.Checksum()
+    with open(file_path, "rb") as f:
+        block = f.read(MiB)
+        while len(block) != 0:
+            checksum.update(block)
+            block = f.read(MiB)
+
+    return base64.b64encode(checksum.digest()).decode()
+
+
+def create_storage_client(project: str | None) -> Client:
+    """
+    Creates a GCS client whose HTTP session can keep a connection per concurrent transfer open. Otherwise, parallel
+    chunk and symbol uploads discard pooled connections and pay for a new TLS handshake on most requests.
+    :param project: the GCS project or None to take it from the environment
+    :return: a storage client with a resized connection pool
+    """
+    client = Client(project=project)
+    adapter = HTTPAdapter(pool_connections=GCS_HTTP_POOL_SIZE, pool_maxsize=GCS_HTTP_POOL_SIZE)
+    client._http.mount("https://", adapter)  # pyright: ignore [reportPrivateUsage, reportUnknownMemberType]
+    return client
+
+
+def upload_large_file(local_file: Path, blob: Blob) -> bool:
+    """
+    Uploads files above PARALLEL_UPLOAD_THRESHOLD as a multipart upload of concurrently transferred chunks, because a
+    single upload stream is far from saturating the available bandwidth for multi-GB artifacts. Keep in mind that the
+    resulting object only has a CRC32C and no MD5 hash.
+    :param local_file: the path of the file to upload
+    :param blob: the (not yet existing) destination blob
+    :return: True if the file was uploaded, False if the blob already exists
+    """
+    if local_file.stat().st_size > PARALLEL_UPLOAD_THRESHOLD:
+        # multipart uploads don't support preconditions, so we have to check for an existing blob up front
+        if blob.exists():
+            return False
+
+        logger.info(f"Uploading {local_file.name} in parallel chunks of {PARALLEL_UPLOAD_CHUNK_SIZE // MiB} MiB")
+        transfer_manager.upload_chunks_concurrently(
+            str(local_file),
+            blob,
+            chunk_size=PARALLEL_UPLOAD_CHUNK_SIZE,
+            # the heavy lifting happens in sockets and hashlib, both release the GIL, so threads are sufficient
+            worker_type=transfer_manager.THREAD,
+            max_workers=PARALLEL_UPLOAD_MAX_WORKERS,
+            timeout=3600,
+        )
+    else:
+        # this file will be split into considerable chunks: set timeout to something high. The CRC32C is computed while
+        # streaming and validated against the one of the finalized object, so we don't need a separate pass to verify.
+        try:
+            blob.upload_from_filename(
+                str(local_file), timeout=3600, num_retries=10, checksum="crc32c", if_generation_match=0
+            )
+        except PreconditionFailed:
+            return False
+
+    return True
+
+
 def parse_gcs_url(storage: str) -> ParseResult | None:
     uri = urlparse(storage)
     if uri.scheme != "gs":
@@ -283,7 +425,11 @@ def parse_gcs_url(storage: str) -> ParseResult | None:
 def upload_file(local_file: Path, dest_blob_name: Path, bucket: Bucket) -> bool:
     blob = bucket.blob(str(dest_blob_name))
 
-    if blob.exists():
+    try:
+        # the precondition lets GCS reject the upload if the blob already exists, which saves us an existence check for
+        # every new file (the vast majority of all uploads)
+        blob.upload_from_filename(str(local_file), num_retries=10, if_generation_match=0)
+    except PreconditionFailed:
         # If the blob exists we can continue with the next file because there should be no duplicate
         # which contains a mismatching symbol table. this is a big assumption, and we should probably
         # cross-check the symbols between the debug-id-equal binaries of each artifact. but this if is
@@ -291,7 +437,6 @@ def upload_file(local_file: Path, dest_blob_name: Path, bucket: Bucket) -> bool:
         logger.info(f"{local_file} exists in symbol-store at {dest_blob_name}. Continue" " with next.")
         return False
 
-    blob.upload_from_filename(str(local_file), num_retries=10)
     return True
 
 
@@ -308,10 +453,11 @@ def upload_symbol_binaries(bucket: Bucket, platform: str, bundle_id: str, binary
     upload_tasks: list[tuple[Path, Path, Bucket]] = []
 
     for root, _, files in os.walk(binary_dir):
+        # the source and destination directories are shared by all files of a root
+        local_dir = Path(root)
+        dest_dir = dest_blob_prefix / local_dir.relative_to(binary_dir)
         for file in files:
-            local_file = Path(root) / file
-            dest_blob_name = dest_blob_prefix / Path(root).relative_to(binary_dir) / file
-            upload_tasks.append((local_file, dest_blob_name, bucket))
+            upload_tasks.append((local_dir / file, dest_dir / file, bucket))
 
     with ThreadPoolExecutor(max_workers=10) as executor:
         futures = [
@@ -329,7 +475,9 @@ def upload_symbol_binaries(bucket: Bucket, platform: str, bundle_id: str, binary
     logger.info(f"Ignored duplicates = {duplicate_count}")
 
 
+@functools.cache
 def validate_shell_deps() -> None:
+    # the tools don't change during a run, so we only need to spawn them once (failures exit and are never cached)
     version = ipsw_version()
     if version:
         logger.info(f"Using ipsw {version}")
@@ -359,6 +507,11 @@ def try_download_to_filename(blob: Blob, local_file_path: Path, num_retries: int
         try:
             blob.download_to_filename(str(local_file_path))
             break
+        except NotFound:
+            # a missing blob won't appear by retrying, and the failed download leaves an empty local file behind
+            logger.error(f"Blob {blob.name} is no longer accessible")
+            local_file_path.unlink(missing_ok=True)
+            return False
         except Exception as e:
             if num_retries > 0:
                 num_retries = num_retries - 1
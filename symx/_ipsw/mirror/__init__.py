@@ -7,10 +7,10 @@ from symx._ipsw.common import IpswSource
 logger = logging.getLogger(__name__)
 
 
-def verify_download(filepath: Path, source: IpswSource) -> bool:
+def verify_download(filepath: Path, source: IpswSource, sha1_digest: str | None = None) -> bool:
     if source.hashes and source.hashes.sha1:
         # if we have a hash-sum in the meta-data, let's verify the download against it
-        if check_sha1(source.hashes.sha1, filepath):
+        if check_sha1(source.hashes.sha1, filepath, sha1_digest):
             logger.info(f"Downloading {filepath.name} completed and SHA-1 verified")
             return True
         else:
@@ -2,7 +2,7 @@ import datetime
 import logging
 import shutil
 import time
-from typing import Iterable, Sequence
+from typing import Iterable
 
 import sentry_sdk
 
@@ -34,9 +34,9 @@ def import_meta_from_appledb(ipsw_storage: IpswGcsStorage) -> None:
     # the meta store could be updated concurrently by both mirror- and extract-workflows, this means we cannot just
     # write the blob with a generation check, because it will fail in that case without chance for recovery or retry.
     # But since importing is an add-only operation, we can simply collect all artifacts that would be added and then add
-    # them individually via update_meta_item() which will always refresh on retry if there was a concurrent update.
-    for artifact in importer.new_artifacts:
-        ipsw_storage.update_meta_item(artifact)
+    # them in one go via update_meta_items() which will always refresh on retry if there was a concurrent update.
+    if importer.new_artifacts:
+        ipsw_storage.update_meta_items(importer.new_artifacts)
 
     # The import state is only updated by the import-workflow, which will never use multiple concurrent runners, so we
     # can use the generation check as a trivial no-retry no-recovery optimistic lock which just fails.
@@ -61,8 +61,9 @@ def mirror(ipsw_storage: IpswGcsStorage, timeout: datetime.timedelta) -> None:
                 continue
 
             filepath = ipsw_storage.local_dir / source.file_name
-            try_download_url_to_file(str(source.link), filepath)
-            if not verify_download(filepath, source):
+            sha1_digest = try_download_url_to_file(str(source.link), filepath)
+            # a download that failed for good (e.g. a dead link) leaves nothing to verify or upload
+            if sha1_digest is None or not verify_download(filepath, source, sha1_digest):
                 artifact.sources[source_idx].processing_state = ArtifactProcessingState.MIRRORING_FAILED
                 artifact.sources[source_idx].update_last_run()
                 ipsw_storage.update_meta_item(artifact)
@@ -70,7 +71,7 @@ def mirror(ipsw_storage: IpswGcsStorage, timeout: datetime.timedelta) -> None:
                 updated_artifact = ipsw_storage.upload_ipsw(artifact, (filepath, source))
                 ipsw_storage.update_meta_item(updated_artifact)
 
-            filepath.unlink()
+            filepath.unlink(missing_ok=True)
 
 
 def extract(ipsw_storage: IpswGcsStorage, timeout: datetime.timedelta) -> None:
@@ -136,12 +137,12 @@ def _source_post_mirror_condition(source: IpswSource) -> bool:
 
 def _post_mirrored_filter(  # pyright: ignore [reportUnusedFunction]
     artifacts: Iterable[IpswArtifact],
-) -> Sequence[IpswArtifact]:
-    return [
+) -> Iterable[IpswArtifact]:
+    return (
         artifact
         for artifact in artifacts
         if any(not _source_post_mirror_condition(source) for source in artifact.sources)
-    ]
+    )
 
 
 migrate_artifact_keys = ["macOS_14.1.2_23B92"]
@@ -154,6 +155,7 @@ def migrate(ipsw_storage: IpswGcsStorage) -> None:
     artifact_key_set = set(migrate_artifact_keys)
     source_filename_set = set(migrate_source_filenames)
 
+    migrated_artifacts: list[IpswArtifact] = []
     for artifact in meta_db.artifacts.values():
         if artifact.key not in artifact_key_set:
             continue
@@ -161,6 +163,7 @@ def migrate(ipsw_storage: IpswGcsStorage) -> None:
         logger.info(f"Processing {artifact.key}")
         sentry_sdk.set_tag("ipsw.artifact.key", artifact.key)
 
+        artifact_migrated = False
         for source_idx, source in enumerate(artifact.sources):
             if source.file_name not in source_filename_set:
                 continue
@@ -170,4 +173,11 @@ def migrate(ipsw_storage: IpswGcsStorage) -> None:
 
             artifact.sources[source_idx].processing_state = ArtifactProcessingState.MIRRORED
             artifact.sources[source_idx].update_last_run()
-            ipsw_storage.update_meta_item(artifact)
+            artifact_migrated = True
+
+        if artifact_migrated:
+            migrated_artifacts.append(artifact)
+
+    # store all migrated artifacts with a single meta-data update
+    if migrated_artifacts:
+        ipsw_storage.update_meta_items(migrated_artifacts)
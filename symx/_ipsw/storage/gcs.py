@@ -1,18 +1,21 @@
 import datetime
 import logging
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Tuple, Iterator, Iterable, Callable, Sequence
 
-import sentry_sdk
-from google.cloud.exceptions import PreconditionFailed
+from google.cloud.exceptions import NotFound, PreconditionFailed
 from google.cloud.storage import Blob, Bucket, Client
 
 from symx._common import (
     ArtifactProcessingState,
-    compare_md5_hash,
+    compare_file_hash,
     upload_symbol_binaries,
     try_download_to_filename,
+    upload_large_file,
+    create_storage_client,
 )
 from symx._ipsw.common import (
     ARTIFACTS_META_JSON,
@@ -35,49 +38,65 @@ def _ipsw_artifact_sort_by_released(artifact: IpswArtifact) -> datetime.date:
 
 def extract_filter(
     artifacts: Iterable[IpswArtifact],
-) -> Sequence[IpswArtifact]:
+) -> Iterable[IpswArtifact]:
     # we can extract from any source that has been mirrored
-    return [
+    return (
         artifact
         for artifact in artifacts
         if any(source.processing_state == ArtifactProcessingState.MIRRORED for source in artifact.sources)
-    ]
+    )
 
 
 def mirror_filter(
     artifacts: Iterable[IpswArtifact],
-) -> Sequence[IpswArtifact]:
+) -> Iterable[IpswArtifact]:
     # to mirror, we want all artifacts...
     # - that have a release date within this and the previous year and
     # - where some of its sources are still indexed
-    return [
+    cutoff = datetime.date(datetime.date.today().year - 1, 1, 1)
+    return (
         artifact
         for artifact in artifacts
         if artifact.released is not None
-        and artifact.released.year >= datetime.date.today().year - 1
+        and artifact.released >= cutoff
         and any(source.processing_state == ArtifactProcessingState.INDEXED for source in artifact.sources)
-    ]
+    )
 
 
 class IpswGcsStorage:
     def __init__(self, local_dir: Path, project: str | None, bucket: str) -> None:
         self.local_dir = local_dir
         self.local_artifacts_meta = self.local_dir / ARTIFACTS_META_JSON
+        self.local_artifacts_meta_generation: int | None = None
         self.local_import_state = self.local_dir / IMPORT_STATE_JSON
         self.project = project
-        self.client: Client = Client(project=self.project)
+        self.client: Client = create_storage_client(self.project)
         self.bucket: Bucket = self.client.bucket(bucket)
 
     def load_artifacts_meta(self) -> Blob:
+        # the meta-data is refreshed before every processed artifact, but most of the time it didn't change since we
+        # last downloaded it. Requesting only the object meta-data lets us skip downloading the entire JSON in that case.
+        remote_blob = self.bucket.get_blob(ARTIFACTS_META_JSON)
+        if remote_blob is None:
+            return self.bucket.blob(ARTIFACTS_META_JSON)
+
+        if remote_blob.generation == self.local_artifacts_meta_generation and self.local_artifacts_meta.is_file():
+            return remote_blob
+
+        # download via a fresh blob, so the generation is taken from the download itself and not pinned to the one
+        # from the meta-data request (which could have been replaced by a concurrent update in the meantime).
         artifacts_meta_blob = self.bucket.blob(ARTIFACTS_META_JSON)
-        if artifacts_meta_blob.exists():
-            artifacts_meta_blob.download_to_filename(str(self.local_artifacts_meta))
+        artifacts_meta_blob.download_to_filename(str(self.local_artifacts_meta))
+        self.local_artifacts_meta_generation = artifacts_meta_blob.generation
         return artifacts_meta_blob
 
     def load_import_state(self) -> Blob:
         import_state_blob = self.bucket.blob(IMPORT_STATE_JSON)
-        if import_state_blob.exists():
+        try:
             import_state_blob.download_to_filename(str(self.local_import_state))
+        except NotFound:
+            # the failed download leaves an empty local file behind which the importer would fail to parse
+            self.local_import_state.unlink(missing_ok=True)
         return import_state_blob
 
     def store_artifacts_meta(self, artifacts_meta_blob: Blob) -> None:
@@ -94,8 +113,6 @@ class IpswGcsStorage:
 
     def upload_ipsw(self, artifact: IpswArtifact, downloaded_source: tuple[Path, IpswSource]) -> IpswArtifact:
         ipsw_file, source = downloaded_source
-        sentry_sdk.set_tag("ipsw.artifact.key", artifact.key)
-        sentry_sdk.set_tag("ipsw.artifact.source", source.file_name)
         source_idx = artifact.sources.index(source)
         if not ipsw_file.is_file():
             raise RuntimeError("Path to upload must be a file")
@@ -104,18 +121,15 @@ class IpswGcsStorage:
 
         mirror_filename = f"mirror/ipsw/{artifact.platform}/{artifact.version}/{artifact.build}/{source.file_name}"
         blob = self.bucket.blob(mirror_filename)
-        if blob.exists():
-            # if the existing remote file has the same MD5 hash as the file we are about to upload, we can go on
+        if upload_large_file(ipsw_file, blob):
+            logger.info("Upload finished. Updating IPSW meta-data.")
+        elif not compare_file_hash(ipsw_file, blob):
+            # if the existing remote file has the same hash as the file we are about to upload, we can go on
             # without uploading and only update meta, since that means some meta is still set to INDEXED instead
             # of MIRRORED. On the other hand, if the hashes differ, then we have a problem and should be getting out
-            if not compare_md5_hash(ipsw_file, blob):
-                logger.error("Trying to upload IPSW that already exists in mirror with a" " different MD5")
-                artifact.sources[source_idx].processing_state = ArtifactProcessingState.MIRRORING_FAILED
-                return artifact
-        else:
-            # this file will be split into considerable chunks: set timeout to something high
-            blob.upload_from_filename(str(ipsw_file), timeout=3600, num_retries=10)
-            logger.info("Upload finished. Updating IPSW meta-data.")
+            logger.error("Trying to upload IPSW that already exists in mirror with a" " different hash")
+            artifact.sources[source_idx].processing_state = ArtifactProcessingState.MIRRORING_FAILED
+            return artifact
 
         artifact.sources[source_idx].mirror_path = mirror_filename
         artifact.sources[source_idx].processing_state = ArtifactProcessingState.MIRRORED
@@ -124,25 +138,41 @@ class IpswGcsStorage:
         return artifact
 
     def update_meta_item(self, ipsw_meta: IpswArtifact, retry: int = 5) -> IpswArtifactDb:
+        return self.update_meta_items([ipsw_meta], retry)
+
+    def update_meta_items(self, ipsw_metas: Sequence[IpswArtifact], retry: int = 5) -> IpswArtifactDb:
+        """
+        Upserts all given artifacts with a single meta-data upload. Every retry refreshes the meta-data, so concurrent
+        updates to other artifacts are never lost.
+        """
         while retry > 0:
             blob, meta_db, generation = self.refresh_artifacts_db()
-            meta_db.upsert(ipsw_meta.key, ipsw_meta)
+            for ipsw_meta in ipsw_metas:
+                meta_db.upsert(ipsw_meta.key, ipsw_meta)
+            # a retry starts from freshly loaded meta-data, so the payload can't be reused across attempts
+            payload = meta_db.model_dump_json().encode()
             try:
                 blob.upload_from_string(
-                    meta_db.model_dump_json(),
+                    payload,
                     if_generation_match=generation,
                 )
-                return meta_db
             except PreconditionFailed:
                 retry = retry - 1
+                continue
+
+            # we know exactly what we just uploaded, so store it locally with the new generation. This way the next
+            # refresh doesn't have to download it again unless someone else changed it in the meantime.
+            self.local_artifacts_meta.write_bytes(payload)
+            self.local_artifacts_meta_generation = blob.generation
+            return meta_db
 
-        raise RuntimeError("Failed to update meta-data item")
+        raise RuntimeError("Failed to update meta-data items")
 
     def refresh_artifacts_db(self) -> Tuple[Blob, IpswArtifactDb, int]:
         blob = self.load_artifacts_meta()
-        if blob.exists():
+        if blob.generation is not None:
             try:
-                fp = open(self.local_artifacts_meta)
+                fp = open(self.local_artifacts_meta, "rb")
             except IOError:
                 meta_db, generation = IpswArtifactDb(), 0
             else:
@@ -154,12 +184,10 @@ class IpswGcsStorage:
         else:
             meta_db, generation = IpswArtifactDb(), 0
 
-        if generation is None:
-            generation = 0
         return blob, meta_db, generation
 
     def artifact_iter(
-        self, filter_fun: Callable[[Iterable[IpswArtifact]], Sequence[IpswArtifact]]
+        self, filter_fun: Callable[[Iterable[IpswArtifact]], Iterable[IpswArtifact]]
     ) -> Iterator[IpswArtifact]:
         """
         This iterator refreshes the database with each yield. So if you do not change the (remote) data during the loop
@@ -171,22 +199,31 @@ class IpswGcsStorage:
 
         Using this iter is the opposite and allows us to work with the latest data and update meta-data to the latest
         state within the context of concurrent long-running workflows.
-        :param filter_fun: a callable that expects some artifacts and returns a filtered list based on some condition
+
+        Each artifact is yielded at most once per iterator, so an artifact whose state the processing failed to change
+        will not be yielded again (and block the loop forever).
+        :param filter_fun: a callable that expects some artifacts and returns those that match some condition
         """
+        yielded_keys: set[str] = set()
         while True:
             _, meta_db, _ = self.refresh_artifacts_db()
             if len(meta_db.artifacts) == 0:
                 logger.error("No artifacts in IPSW meta-data.")
                 return
 
-            filtered_artifacts = filter_fun(meta_db.artifacts.values())
-            logger.info(f"Number of filtered artifacts = {len(filtered_artifacts)}")
-            sorted_by_age_descending = sorted(filtered_artifacts, key=_ipsw_artifact_sort_by_released, reverse=True)
-
-            if len(sorted_by_age_descending) == 0:
+            # we only ever process the most recently released artifact, so a single pass over the filtered artifacts
+            # is enough and there is no need to collect (or sort) them
+            artifact = max(
+                (artifact for artifact in filter_fun(meta_db.artifacts.values()) if artifact.key not in yielded_keys),
+                key=_ipsw_artifact_sort_by_released,
+                default=None,
+            )
+            if artifact is None:
                 break
 
-            yield sorted_by_age_descending[0]
+            logger.info(f"Next artifact to process = {artifact.key}")
+            yielded_keys.add(artifact.key)
+            yield artifact
 
     def download_ipsw(self, ipsw_source: IpswSource) -> Path | None:
         logger.info(f"Downloading source {ipsw_source.file_name}")
@@ -196,10 +233,6 @@ class IpswGcsStorage:
 
         blob = self.bucket.blob(ipsw_source.mirror_path)
         local_ipsw_path = self.local_dir / ipsw_source.file_name
-        if not blob.exists():
-            logger.error("The IPSW-source references a mirror-path that is no longer accessible")
-            return None
-
         if not (try_download_to_filename(blob, local_ipsw_path) and verify_download(local_ipsw_path, ipsw_source)):
             return None
 
@@ -219,16 +252,22 @@ class IpswGcsStorage:
         self.update_meta_item(artifact)
 
     def clean_local_dir(self) -> None:
-        for item in self.local_dir.iterdir():
-            if item.is_dir():
-                try:
-                    shutil.rmtree(item)
-                    logger.info(f"Removed directory {item} as part of local storage cleanup")
-                except Exception as e:
-                    logger.error(f"Error occurred while removing directory: {item}, Error: {e}")
-            elif item.is_file() and item.suffix == ".ipsw":
-                try:
-                    item.unlink()
-                    logger.info(f"Removed {item} as part of local storage cleanup")
-                except Exception as e:
-                    logger.error(f"Error occurred while removing directory: {item}, Error: {e}")
+        # removing extracted IPSW trees is bound by file-system meta-data updates, so we can overlap the removals
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # consume the results, so that errors from the removals are raised here
+            list(executor.map(_remove_local_item, self.local_dir.iterdir()))
+
+
+def _remove_local_item(item: Path) -> None:
+    if item.is_dir():
+        try:
+            shutil.rmtree(item)
+            logger.info(f"Removed directory {item} as part of local storage cleanup")
+        except Exception as e:
+            logger.error(f"Error occurred while removing directory: {item}, Error: {e}")
+    elif item.is_file() and item.suffix == ".ipsw":
+        try:
+            item.unlink()
+            logger.info(f"Removed {item} as part of local storage cleanup")
+        except Exception as e:
+            logger.error(f"Error occurred while removing directory: {item}, Error: {e}")
@@ -8,6 +8,7 @@ import subprocess
 import tempfile
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterator
@@ -39,9 +40,11 @@ PLATFORMS = [
 ]
 
 ARTIFACTS_META_JSON = "ota_image_meta.json"
+OTA_MIRROR_WORKERS = 2
 
 
-@dataclass
+# there are thousands of these in the meta-data, so we don't want a __dict__ for each of them
+@dataclass(slots=True)
 class OtaArtifact:
     build: str
     description: list[str]
@@ -67,6 +70,13 @@ class OtaArtifact:
     def update_last_run(self) -> None:
         self.last_run = github_run_id()
 
+    @property
+    def identity(self) -> tuple[str, str, str, str, str, str]:
+        """
+        All values that contribute to the identity of an artifact (see merge_meta_data()).
+        """
+        return self.build, self.version, self.platform, self.url, self.hash, self.hash_algorithm
+
 
 OtaMetaData = dict[str, OtaArtifact]
 
@@ -160,8 +170,8 @@ def parse_download_meta_output(
 
 def retrieve_current_meta() -> OtaMetaData:
     meta: OtaMetaData = {}
+    meta_requests: list[tuple[str, bool, list[str]]] = []
     for platform in PLATFORMS:
-        logger.info(f"Downloading meta for {platform}")
         cmd = [
             "ipsw",
             "download",
@@ -171,12 +181,22 @@ def retrieve_current_meta() -> OtaMetaData:
             "--urls",
             "--json",
         ]
-
-        parse_download_meta_output(platform, subprocess.run(cmd, capture_output=True), meta, False)
+        meta_requests.append((platform, False, cmd))
 
         beta_cmd = cmd.copy()
         beta_cmd.append("--beta")
-        parse_download_meta_output(platform, subprocess.run(beta_cmd, capture_output=True), meta, True)
+        meta_requests.append((platform, True, beta_cmd))
+
+    # each request mostly waits on Apple's endpoint, so we run them all at once. The results are parsed in submission
+    # order, so merging them into the meta-data is independent of which request finishes first.
+    logger.info(f"Downloading meta for {', '.join(PLATFORMS)}")
+    with ThreadPoolExecutor(max_workers=len(meta_requests)) as executor:
+        futures = [
+            (platform, beta, executor.submit(subprocess.run, cmd, capture_output=True))
+            for platform, beta, cmd in meta_requests
+        ]
+        for platform, beta, future in futures:
+            parse_download_meta_output(platform, future.result(), meta, beta)
 
     return meta
 
@@ -186,7 +206,11 @@ def merge_lists(a: list[str] | None, b: list[str] | None) -> list[str]:
         a = []
     if b is None:
         b = []
-    return list(set(a + b))
+    if a == b:
+        # the common case in a merge: nothing changed on Apple's side
+        return a
+    # ordered de-duplication keeps merged lists stable between runs (and thus the meta-data diffs small)
+    return list(dict.fromkeys((*a, *b)))
 
 
 def generate_duplicate_key_from(ours: OtaMetaData, their_key: str) -> str:
@@ -212,14 +236,20 @@ def merge_meta_data(ours: OtaMetaData, theirs: OtaMetaData) -> None:
     :param theirs: The meta-data of all OTA artifacts currently provided by Apple.
     :return: None
     """
+    # index the builds of our items by the values that identify beta <-> normal release duplicates, so we don't have to
+    # scan all of ours for every new item
+    builds_by_release: dict[tuple[str, str, str, str], set[str]] = {}
+    for our_item in ours.values():
+        builds_by_release.setdefault(_release_identity(our_item), set()).add(our_item.build)
+
     for their_key, their_item in theirs.items():
-        if their_key in ours.keys():
+        our_item = ours.get(their_key)
+        if our_item is not None:
             # we already have that id in out meta-store
-            our_item = ours[their_key]
 
             # merge data that can change over time but has no effect on the identity of the artifact
-            ours[their_key].description = merge_lists(our_item.description, their_item.description)
-            ours[their_key].devices = merge_lists(our_item.devices, their_item.devices)
+            our_item.description = merge_lists(our_item.description, their_item.description)
+            our_item.devices = merge_lists(our_item.devices, their_item.devices)
 
             # If we have differing build but all other values that contribute to identity are the same, then we have
             # a duplicate that requires a corresponding duplicate key. Another option would be to merge the builds
@@ -238,18 +268,12 @@ def merge_meta_data(ours: OtaMetaData, theirs: OtaMetaData) -> None:
                 duplicate_key = generate_duplicate_key_from(ours, their_key)
                 ours[duplicate_key] = their_item
                 ours[duplicate_key].processing_state = ArtifactProcessingState.INDEXED_DUPLICATE
+                builds_by_release.setdefault(_release_identity(their_item), set()).add(their_item.build)
                 continue
 
             # if any of the remaining identity-contributing values differ at this point then our identity matching is
             # still incomplete.
-            if not (
-                their_item.build == our_item.build
-                and their_item.version == our_item.version
-                and their_item.platform == our_item.platform
-                and their_item.url == our_item.url
-                and their_item.hash == our_item.hash
-                and their_item.hash_algorithm == our_item.hash_algorithm
-            ):
+            if their_item.identity != our_item.identity:
                 raise RuntimeError(
                     "Matching keys with different value:\n\tlocal:" f" {our_item}\n\tapple: {their_item}"
                 )
@@ -258,31 +282,29 @@ def merge_meta_data(ours: OtaMetaData, theirs: OtaMetaData) -> None:
             ours[their_key] = their_item
 
             # identify and mark beta <-> normal release duplicates
-            for _, our_v in ours.items():
-                if (
-                    their_item.hash == our_v.hash
-                    and their_item.hash_algorithm == our_v.hash_algorithm
-                    and their_item.platform == our_v.platform
-                    and their_item.version == our_v.version
-                    and their_item.build != our_v.build
-                ):
-                    ours[their_key].processing_state = ArtifactProcessingState.INDEXED_DUPLICATE
-                    break
-
-
-def check_ota_hash(ota_meta: OtaArtifact, filepath: Path) -> bool:
+            release_builds = builds_by_release.setdefault(_release_identity(their_item), set())
+            if any(build != their_item.build for build in release_builds):
+                ours[their_key].processing_state = ArtifactProcessingState.INDEXED_DUPLICATE
+            release_builds.add(their_item.build)
+
+
+def _release_identity(item: OtaArtifact) -> tuple[str, str, str, str]:
+    return item.hash, item.hash_algorithm, item.platform, item.version
+
+
+def check_ota_hash(ota_meta: OtaArtifact, filepath: Path, sha1_digest: str | None = None) -> bool:
     if ota_meta.hash_algorithm != "SHA-1":
         raise RuntimeError(f"Unexpected hash-algo: {ota_meta.hash_algorithm}")
 
-    return check_sha1(ota_meta.hash, filepath)
+    return check_sha1(ota_meta.hash, filepath, sha1_digest)
 
 
 def download_ota_from_apple(ota_meta: OtaArtifact, download_dir: Path) -> Path:
     logger.info(f"Downloading {ota_meta}")
 
     filepath = download_dir / f"{ota_meta.platform}_{ota_meta.version}_{ota_meta.build}_{ota_meta.id}.zip"
-    try_download_url_to_file(ota_meta.url, filepath)
-    if check_ota_hash(ota_meta, filepath):
+    sha1_digest = try_download_url_to_file(ota_meta.url, filepath)
+    if sha1_digest is not None and check_ota_hash(ota_meta, filepath, sha1_digest):
         logger.info(f"Downloading {ota_meta} completed")
         return filepath
 
@@ -312,58 +334,84 @@ class OtaMirror:
         start = time.time()
         self.update_meta()
         with tempfile.TemporaryDirectory() as download_dir:
-            key: str
-            ota: OtaArtifact
-            for key, ota in self.meta.items():
-                if int(time.time() - start) > timeout.seconds:
-                    logger.info(f"Exiting OTA mirror due to elapsed timeout of {timeout}")
-                    return
-
-                if not ota.is_indexed():
-                    continue
-
-                set_sentry_artifact_tags(key, ota)
-                try:
-                    ota_file = download_ota_from_apple(ota, Path(download_dir))
-                    self.storage.save_ota(key, ota, ota_file)
-                    ota_file.unlink()
-                except Exception as e:
-                    sentry_sdk.capture_exception(e)
-                    logger.exception(e)
-                    ota.processing_state = ArtifactProcessingState.INDEXED_INVALID
-                    ota.update_last_run()
-                    self.storage.update_meta_item(key, ota)
+            # the mirror is bound by the network rather than by us, so we download a few OTAs concurrently. every running
+            # download keeps a multi-GB file in download_dir, which is why the number of workers must stay small.
+            with ThreadPoolExecutor(max_workers=OTA_MIRROR_WORKERS) as executor:
+                running: set[Future[None]] = set()
+                key: str
+                ota: OtaArtifact
+                for key, ota in self.meta.items():
+                    if not ota.is_indexed():
+                        continue
+
+                    if len(running) >= OTA_MIRROR_WORKERS:
+                        done, running = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+
+                    if int(time.time() - start) > timeout.seconds:
+                        logger.info(f"Exiting OTA mirror due to elapsed timeout of {timeout}")
+                        break
+
+                    running.add(executor.submit(self.mirror_ota, key, ota, Path(download_dir)))
+
+                for future in running:
+                    future.result()
+
+    def mirror_ota(self, key: str, ota: OtaArtifact, download_dir: Path) -> None:
+        # each worker gets its own hub, so the artifact tags of concurrent downloads don't overwrite each other
+        with sentry_sdk.Hub(sentry_sdk.Hub.current):
+            set_sentry_artifact_tags(key, ota)
+            try:
+                ota_file = download_ota_from_apple(ota, download_dir)
+                self.storage.save_ota(key, ota, ota_file)
+                ota_file.unlink()
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+                logger.exception(e)
+                ota.processing_state = ArtifactProcessingState.INDEXED_INVALID
+                ota.update_last_run()
+                self.storage.update_meta_item(key, ota)
 
 
 DYLD_SHARED_CACHE = "dyld_shared_cache"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DSCSearchResult:
     arch: Arch
     artifact: Path
     split_dir: Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MountInfo:
     dev: str
     id: str
     point: Path
 
 
+PATCHING_RE = re.compile(r"Patching (.*) to (.*)")
+
+
 def patch_cryptex_dmg(artifact: Path, output_dir: Path) -> dict[str, Path]:
     dmg_files: dict[str, Path] = {}
-    result = subprocess.run(
+    # ipsw reports the patched DMGs on stderr, which we parse line by line while it runs instead of buffering all of it
+    with subprocess.Popen(
         ["ipsw", "ota", "patch", str(artifact), "--output", str(output_dir)],
-        capture_output=True,
-    )
-    if result.returncode == 0 and result.stderr != b"":
-        for line in result.stderr.decode("utf-8").splitlines():
-            re_match = re.search("Patching (.*) to (.*)", line)
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        encoding="utf-8",
+    ) as proc:
+        assert proc.stderr is not None
+        for line in proc.stderr:
+            re_match = PATCHING_RE.search(line)
             if re_match:
                 dmg_files[re_match.group(1)] = Path(re_match.group(2))
 
+    if proc.returncode != 0:
+        return {}
+
     return dmg_files
 
 
@@ -375,7 +423,8 @@ def find_system_os_dmgs(search_dir: Path) -> list[Path]:
 
 
 def parse_hdiutil_mount_output(cmd_output: str) -> MountInfo:
-    mount_info = cmd_output.splitlines().pop().split()
+    # the mount point is reported on the last line, so we don't need to split all the lines before it
+    mount_info = cmd_output.rstrip().rsplit("\n", 1)[-1].split()
     return MountInfo(mount_info[0], mount_info[1], Path(mount_info[2]))
 
 
@@ -384,25 +433,14 @@ class OtaExtractError(Exception):
 
 
 def split_dsc(search_result: list[DSCSearchResult]) -> list[Path]:
-    split_dirs: list[Path] = []
-    for result_item in search_result:
-        logger.info(f"\t\tSplitting {DYLD_SHARED_CACHE} of {result_item.artifact}")
-        result = subprocess.run(
-            [
-                "ipsw",
-                "dyld",
-                "split",
-                str(result_item.artifact),
-                "--output",
-                str(result_item.split_dir),
-            ],
-            capture_output=True,
-        )
-        if result.returncode != 0:
-            logger.warning(f"Split for {result_item.artifact} (arch: {result_item.arch} failed:" f" {result}")
-        else:
-            logger.debug(f"\t\t\tResult from split: {result}")
-            split_dirs.append(result_item.split_dir)
+    # every split is an independent ipsw process writing to its own split_dir, so we can run them concurrently. map()
+    # keeps the order of the search results, so the split_dirs are the same as if we split sequentially.
+    with ThreadPoolExecutor(max_workers=min(len(search_result), os.cpu_count() or 2) or 1) as executor:
+        split_results = list(executor.map(_split_dsc_item, search_result))
+
+    split_dirs = [
+        result_item.split_dir for result_item, split_result in zip(search_result, split_results) if split_result
+    ]
 
     # If none of the split attempts were successful the OTA extraction failed
     if len(split_dirs) == 0:
@@ -412,6 +450,27 @@ def split_dsc(search_result: list[DSCSearchResult]) -> list[Path]:
     return split_dirs
 
 
+def _split_dsc_item(result_item: DSCSearchResult) -> bool:
+    logger.info(f"\t\tSplitting {DYLD_SHARED_CACHE} of {result_item.artifact}")
+    result = subprocess.run(
+        [
+            "ipsw",
+            "dyld",
+            "split",
+            str(result_item.artifact),
+            "--output",
+            str(result_item.split_dir),
+        ],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        logger.warning(f"Split for {result_item.artifact} (arch: {result_item.arch} failed:" f" {result}")
+        return False
+
+    logger.debug(f"\t\t\tResult from split: {result}")
+    return True
+
+
 def split_dir_exists_in_dsc_search_results(split_dir: Path, dsc_search_result: list[DSCSearchResult]) -> bool:
     for result_item in dsc_search_result:
         if split_dir == result_item.split_dir:
@@ -433,9 +492,17 @@ def find_dsc(input_dir: Path, ota_meta: OtaArtifact, output_dir: Path) -> list[D
     counter = 1
     dsc_search_results: list[DSCSearchResult] = []
     for path_prefix in dsc_path_prefix_options:
+        # list each candidate directory once instead of probing it for every architecture
+        dsc_dir = input_dir / path_prefix
+        if not dsc_dir.is_dir():
+            continue
+        with os.scandir(dsc_dir) as entries:
+            dsc_dir_files = {entry.name for entry in entries if entry.is_file()}
+
         for arch in Arch:
-            dsc_path = input_dir / (path_prefix + DYLD_SHARED_CACHE + "_" + arch)
-            if os.path.isfile(dsc_path):
+            dsc_file_name = DYLD_SHARED_CACHE + "_" + arch
+            if dsc_file_name in dsc_dir_files:
+                dsc_path = dsc_dir / dsc_file_name
                 split_dir = output_dir / "split_symbols" / f"{ota_meta.version}_{ota_meta.build}_{arch}"
 
                 if split_dir_exists_in_dsc_search_results(split_dir, dsc_search_results):
@@ -497,7 +564,9 @@ def extract_ota(artifact: Path, output_dir: Path) -> Path | None:
             "-o",
             output_dir,
         ],
-        capture_output=True,
+        # we don't look at the output, so there is no need to buffer it
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
 
     extract_dirs = list_dirs_in(output_dir)
@@ -515,31 +584,29 @@ def extract_ota(artifact: Path, output_dir: Path) -> Path | None:
 
 def iter_mirror(storage: OtaStorage) -> Iterator[tuple[str, OtaArtifact]]:
     """
-    A generator that reloads the meta-data on every iteration, so we fetch updated mirrored artifacts. This allows
-    us to modify the meta-data in the loop that iterates over the output.
+    A generator that collects all mirrored artifacts from the meta-data and only reloads the meta-data once it
+    processed all of them, so we fetch artifacts that were mirrored in the meantime. This allows us to modify the
+    meta-data in the loop that iterates over the output. Every artifact is yielded at most once, even if the loop
+    didn't change its processing state.
     :return: The next current mirrored OtaArtifact to be processed together with its key.
     """
+    yielded_keys: set[str] = set()
     while True:
-        mirrored_key: str | None = None
-        mirrored_ota: OtaArtifact | None = None
         ota_meta = storage.load_meta()
         if ota_meta is None:
             logger.error("Could not retrieve meta-data from storage.")
             return
 
-        for key, ota in ota_meta.items():
-            if ota.is_mirrored():
-                logger.debug(f"Found mirrored OTA: {key}")
-                mirrored_key = key
-                mirrored_ota = ota
-                break
-
-        if mirrored_ota is None or mirrored_key is None:
+        pending = [(key, ota) for key, ota in ota_meta.items() if ota.is_mirrored() and key not in yielded_keys]
+        if len(pending) == 0:
             # this means we could not find any more mirrored OTAs
             logger.info("No more mirrored OTAs available exiting iter_mirror().")
             return
-        else:
+
+        logger.debug(f"Found {len(pending)} mirrored OTAs")
+        for mirrored_key, mirrored_ota in pending:
             logger.debug(f"Yielding mirrored OTA for further processing: {mirrored_ota}")
+            yielded_keys.add(mirrored_key)
             yield mirrored_key, mirrored_ota
 
 
@@ -555,44 +622,52 @@ class OtaExtract:
         start = time.time()
         key: str
         ota: OtaArtifact
-        for key, ota in iter_mirror(self.storage):
-            if int(time.time() - start) > timeout.seconds:
-                logger.warning(f"Exiting OTA extract due to elapsed timeout of {timeout}")
-                return
-
-            set_sentry_artifact_tags(key, ota)
+        with tempfile.TemporaryDirectory(suffix="_ota_extract") as scratch_dir:
+            for key, ota in iter_mirror(self.storage):
+                if int(time.time() - start) > timeout.seconds:
+                    logger.warning(f"Exiting OTA extract due to elapsed timeout of {timeout}")
+                    return
 
-            with tempfile.TemporaryDirectory() as ota_work_dir:
-                work_dir_path = Path(ota_work_dir)
-                logger.debug(f"Download mirrored {key} to {work_dir_path}")
-                local_ota_path = self.storage.load_ota(ota, work_dir_path)
-                if local_ota_path is None:
-                    # means there is no OTA at the specified OTA location, although this was defined as MIRRORED
-                    # let's set this back to INDEXED, so the mirror workflow tries to download this again.
-                    ota.download_path = None
-                    ota.processing_state = ArtifactProcessingState.INDEXED
-                    ota.update_last_run()
-                    self.storage.update_meta_item(key, ota)
-                    continue
+                set_sentry_artifact_tags(key, ota)
 
+                # every OTA gets its own work dir in a scratch dir shared by the whole run, which also guarantees we clean
+                # up everything at the end of the run
+                work_dir_path = Path(scratch_dir) / key
+                work_dir_path.mkdir()
                 try:
-                    self.extract_symbols_from_ota(local_ota_path, key, ota, work_dir_path)
-                except OtaExtractError as e:
-                    # we only "handle" OtaExtractError as something where we can go on, all
-                    # other exceptions should just stop the symbol-extraction process.
-                    sentry_sdk.capture_exception(e)
-                    logger.warning(f"Failed to extract symbols from {ota}: {e}")
-                    # also need to mark failing cases, because otherwise they will fail again
-                    ota.processing_state = ArtifactProcessingState.SYMBOL_EXTRACTION_FAILED
-                    ota.update_last_run()
-                    self.storage.update_meta_item(key, ota)
+                    logger.debug(f"Download mirrored {key} to {work_dir_path}")
+                    local_ota_path = self.storage.load_ota(ota, work_dir_path)
+                    if local_ota_path is None:
+                        # means there is no OTA at the specified OTA location, although this was defined as MIRRORED
+                        # let's set this back to INDEXED, so the mirror workflow tries to download this again.
+                        ota.download_path = None
+                        ota.processing_state = ArtifactProcessingState.INDEXED
+                        ota.update_last_run()
+                        self.storage.update_meta_item(key, ota)
+                        continue
+
+                    try:
+                        self.extract_symbols_from_ota(local_ota_path, key, ota, work_dir_path)
+                    except OtaExtractError as e:
+                        # we only "handle" OtaExtractError as something where we can go on, all
+                        # other exceptions should just stop the symbol-extraction process.
+                        sentry_sdk.capture_exception(e)
+                        logger.warning(f"Failed to extract symbols from {ota}: {e}")
+                        # also need to mark failing cases, because otherwise they will fail again
+                        ota.processing_state = ArtifactProcessingState.SYMBOL_EXTRACTION_FAILED
+                        ota.update_last_run()
+                        self.storage.update_meta_item(key, ota)
+                finally:
+                    rmdir_if_exists(work_dir_path)
 
     def try_processing_ota_as_cryptex(
         self, local_ota: Path, ota_meta_key: str, ota_meta: OtaArtifact, work_dir: Path
     ) -> bool:
-        with tempfile.TemporaryDirectory(suffix="_cryptex_dmg") as cryptex_patch_dir:
+        cryptex_patch_dir = work_dir / "cryptex_dmg"
+        cryptex_patch_dir.mkdir()
+        try:
             logger.info(f"Trying patch_cryptex_dmg with {local_ota}")
-            extracted_dmgs = patch_cryptex_dmg(local_ota, Path(cryptex_patch_dir))
+            extracted_dmgs = patch_cryptex_dmg(local_ota, cryptex_patch_dir)
             if len(extracted_dmgs) != 0:
                 logger.info(
                     "\tCryptex patch successful. Mount, split, symsorting" f" {DYLD_SHARED_CACHE} for: {local_ota}"
@@ -600,16 +675,23 @@ class OtaExtract:
                 self.process_cryptex_dmg(extracted_dmgs, ota_meta_key, ota_meta, work_dir)
                 # TODO: maybe instead of bool that should be a container of paths produced in work_dir
                 return True
+        finally:
+            # the patched DMGs are huge, so we don't wait for the work dir to be cleaned up
+            rmdir_if_exists(cryptex_patch_dir)
 
         return False
 
     def process_ota_directly(self, local_ota: Path, ota_meta_key: str, ota_meta: OtaArtifact, work_dir: Path) -> None:
-        with tempfile.TemporaryDirectory(suffix="_dsc_extract") as extract_dsc_tmp_dir:
-            extracted_dsc_dir = extract_ota(local_ota, Path(extract_dsc_tmp_dir))
+        extract_dsc_dir = work_dir / "dsc_extract"
+        extract_dsc_dir.mkdir()
+        try:
+            extracted_dsc_dir = extract_ota(local_ota, extract_dsc_dir)
             logger.info(f"\t\tSplitting & symsorting {DYLD_SHARED_CACHE} for: {local_ota}")
 
             if extracted_dsc_dir:
                 self.split_and_symsort_dsc(extracted_dsc_dir, ota_meta_key, ota_meta, work_dir)
+        finally:
+            rmdir_if_exists(extract_dsc_dir)
 
     def extract_symbols_from_ota(
         self, local_ota: Path, ota_meta_key: str, ota_meta: OtaArtifact, work_dir: Path
@@ -651,13 +733,29 @@ class OtaExtract:
         ota_meta: OtaArtifact,
         output_dir: Path,
     ) -> None:
-        for split_dir in split_dirs:
-            bundle_id = f"ota_{ota_meta_key}"
-            symbols_output_dir = output_dir / "symbols" / bundle_id
-            symsort(
-                split_dir,
-                symbols_output_dir,
-                ota_meta.platform,
-                bundle_id,
-            )
-            self.storage.upload_symbols(symbols_output_dir, ota_meta_key, ota_meta, bundle_id)
+        bundle_id = f"ota_{ota_meta_key}"
+        # symsort each split into its own output directory so the symsorter processes can run concurrently. the uploads
+        # happen on this thread as each symsort completes, because each of them also updates the artifact's meta-data.
+        symsort_error: Exception | None = None
+        with ThreadPoolExecutor(max_workers=min(len(split_dirs), os.cpu_count() or 2) or 1) as executor:
+            futures: dict[Future[None], Path] = {}
+            for idx, split_dir in enumerate(split_dirs):
+                symbols_output_dir = output_dir / "symbols" / str(idx) / bundle_id
+                future = executor.submit(symsort, split_dir, symbols_output_dir, ota_meta.platform, bundle_id)
+                futures[future] = symbols_output_dir
+
+            for future in as_completed(futures):
+                symbols_output_dir = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    # a failing split must not prevent uploading the others, we raise once all of them are done
+                    if symsort_error is None:
+                        symsort_error = e
+                    continue
+
+                self.storage.upload_symbols(symbols_output_dir, ota_meta_key, ota_meta, bundle_id)
+                rmdir_if_exists(symbols_output_dir)
+
+        if symsort_error is not None:
+            raise symsort_error
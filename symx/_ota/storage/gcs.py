@@ -1,18 +1,18 @@
 import json
 import logging
-import tempfile
 from pathlib import Path
 
-from google.cloud.exceptions import PreconditionFailed
+from google.cloud.exceptions import NotFound, PreconditionFailed
 from google.cloud.storage import Blob, Client, Bucket
 
 from symx._common import (
     DataClassJSONEncoder,
     ArtifactProcessingState,
-    compare_md5_hash,
+    compare_file_hash,
     parse_gcs_url,
     upload_symbol_binaries,
     try_download_to_filename,
+    create_storage_client,
 )
 from symx._ota import (
     OtaArtifact,
@@ -32,12 +32,12 @@ def convert_image_name_to_path(old_name: str) -> str:
 
 
 def download_and_hydrate_meta(blob: Blob) -> tuple[OtaMetaData, int]:
+    # the meta-data easily fits into memory, so there is no need for a round-trip through a temporary file
     result: OtaMetaData = {}
-    with tempfile.NamedTemporaryFile() as f:
-        blob.download_to_filename(f.name)
-        generation = blob.generation
-        for k, v in json.load(f.file).items():
-            result[k] = OtaArtifact(**v)
+    meta_json = blob.download_as_bytes()
+    generation = blob.generation
+    for k, v in json.loads(meta_json).items():
+        result[k] = OtaArtifact(**v)
 
     if generation is None:
         generation = 0
@@ -47,7 +47,7 @@ def download_and_hydrate_meta(blob: Blob) -> tuple[OtaMetaData, int]:
 class OtaGcsStorage(OtaStorage):
     def __init__(self, project: str | None, bucket: str) -> None:
         self.project = project
-        self.client: Client = Client(project=self.project)
+        self.client: Client = create_storage_client(self.project)
         self.bucket: Bucket = self.client.bucket(bucket)
 
     def name(self) -> str:
@@ -58,9 +58,9 @@ class OtaGcsStorage(OtaStorage):
 
         while retry > 0:
             blob = self.bucket.blob(ARTIFACTS_META_JSON)
-            if blob.exists():
+            try:
                 ours, generation_match_precondition = download_and_hydrate_meta(blob)
-            else:
+            except NotFound:
                 ours, generation_match_precondition = {}, 0
 
             merge_meta_data(ours, theirs)
@@ -77,9 +77,9 @@ class OtaGcsStorage(OtaStorage):
 
     def load_meta(self) -> OtaMetaData | None:
         blob = self.bucket.blob(ARTIFACTS_META_JSON)
-        if blob.exists():
+        try:
             ours, _ = download_and_hydrate_meta(blob)
-        else:
+        except NotFound:
             logger.warning("Failed to load meta-data")
             return None
 
@@ -92,16 +92,16 @@ class OtaGcsStorage(OtaStorage):
         logger.info(f"Start uploading {ota_file.name} to {self.bucket.name}")
         mirror_filename = convert_image_name_to_path(ota_file.name)
         blob = self.bucket.blob(mirror_filename)
-        if blob.exists():
-            # if the existing remote file has the same MD5 hash as the file we are about to upload, we can go on without
+        try:
+            # this file will be split into considerable chunks: set timeout to something high
+            blob.upload_from_filename(str(ota_file), timeout=3600, checksum="crc32c", if_generation_match=0)
+            logger.info("Upload finished. Updating OTA meta-data.")
+        except PreconditionFailed:
+            # if the existing remote file has the same hash as the file we are about to upload, we can go on without
             # uploading and only update meta, since that means some meta is still set to INDEXED instead of MIRRORED.
             # On the other hand, if the hashes differ, then we have a problem and should be getting out
-            if not compare_md5_hash(ota_file, blob):
+            if not compare_file_hash(ota_file, blob):
                 return
-        else:
-            # this file will be split into considerable chunks: set timeout to something high
-            blob.upload_from_filename(str(ota_file), timeout=3600)
-            logger.info("Upload finished. Updating OTA meta-data.")
 
         ota_meta.download_path = mirror_filename
         ota_meta.processing_state = ArtifactProcessingState.MIRRORED
@@ -115,10 +115,6 @@ class OtaGcsStorage(OtaStorage):
 
         blob = self.bucket.blob(ota.download_path)
         local_ota_path = download_dir / f"{ota.id}.zip"
-        if not blob.exists():
-            logger.error("The OTA references a mirror-path that is no longer accessible")
-            return None
-
         if not try_download_to_filename(blob, local_ota_path):
             return None
 
@@ -133,12 +129,21 @@ class OtaGcsStorage(OtaStorage):
 
         while retry > 0:
             blob = self.bucket.blob(ARTIFACTS_META_JSON)
-            if blob.exists():
+            try:
                 ours, generation_match_precondition = download_and_hydrate_meta(blob)
-            else:
+            except NotFound:
                 ours, generation_match_precondition = {}, 0
 
-            ours[ota_meta_key] = ota_meta
+            our_item = ours.get(ota_meta_key)
+            if our_item is None:
+                ours[ota_meta_key] = ota_meta
+            else:
+                # `ota_meta` can be from a snapshot that is much older than the current meta-data (e.g. in iter_mirror()).
+                # A concurrent meta-data update might have merged descriptions or devices into the item since, so we only
+                # apply the fields owned by the processing workflows to the current item instead of replacing it.
+                our_item.download_path = ota_meta.download_path
+                our_item.processing_state = ota_meta.processing_state
+                our_item.last_run = ota_meta.last_run
             try:
                 blob.upload_from_string(
                     json.dumps(ours, cls=DataClassJSONEncoder),
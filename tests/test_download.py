@@ -0,0 +1,160 @@
+import datetime
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+import requests
+
+from symx import _common
+from symx._common import ArtifactProcessingState, download_url_to_file, try_download_url_to_file
+from symx._ipsw import runners
+from symx._ipsw.common import IpswArtifact, IpswArtifactHashes, IpswPlatform, IpswReleaseStatus, IpswSource
+
+content = bytes(range(256)) * 4096
+partial_size = 300_000
+
+
+def make_response(status_code: int, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers["content-length"] = str(len(body))
+    response.raw = io.BytesIO(body)
+    response.url = "https://example.com/ota.zip"
+    return response
+
+
+class StubSession:
+    def __init__(self, honor_range: bool = True, status_code: int | None = None) -> None:
+        self.honor_range = honor_range
+        self.status_code = status_code
+        self.requested_headers: list[dict[str, str]] = []
+
+    def get(self, url: str, stream: bool, headers: dict[str, str]) -> requests.Response:
+        self.requested_headers.append(headers)
+        if self.status_code is not None:
+            return make_response(self.status_code, b"error page")
+
+        range_header = headers.get("Range")
+        if self.honor_range and range_header is not None:
+            offset = int(range_header.removeprefix("bytes=").removesuffix("-"))
+            if offset >= len(content):
+                return make_response(416, b"")
+            return make_response(206, content[offset:])
+
+        return make_response(200, content)
+
+
+@pytest.fixture
+def partial_download(tmp_path: Path) -> Path:
+    filepath = tmp_path / "ota.zip"
+    filepath.write_bytes(content[:partial_size])
+    return filepath
+
+
+def test_download_url_to_file_resumes_partial_download(monkeypatch: pytest.MonkeyPatch, partial_download: Path) -> None:
+    session = StubSession()
+    monkeypatch.setattr(_common, "download_session", lambda: session)
+
+    sha1_digest = download_url_to_file("https://example.com/ota.zip", partial_download, resume=True)
+
+    assert session.requested_headers == [{"Range": f"bytes={partial_size}-"}]
+    assert partial_download.read_bytes() == content
+    assert sha1_digest == hashlib.sha1(content).hexdigest()
+
+
+def test_download_url_to_file_restarts_when_range_is_ignored(
+    monkeypatch: pytest.MonkeyPatch, partial_download: Path
+) -> None:
+    session = StubSession(honor_range=False)
+    monkeypatch.setattr(_common, "download_session", lambda: session)
+
+    sha1_digest = download_url_to_file("https://example.com/ota.zip", partial_download, resume=True)
+
+    assert partial_download.read_bytes() == content
+    assert sha1_digest == hashlib.sha1(content).hexdigest()
+
+
+def test_download_url_to_file_keeps_partial_download_on_error(
+    monkeypatch: pytest.MonkeyPatch, partial_download: Path
+) -> None:
+    session = StubSession(status_code=503)
+    monkeypatch.setattr(_common, "download_session", lambda: session)
+
+    with pytest.raises(requests.HTTPError):
+        download_url_to_file("https://example.com/ota.zip", partial_download, resume=True)
+
+    assert partial_download.read_bytes() == content[:partial_size]
+
+
+def test_download_url_to_file_hashes_complete_file_on_range_not_satisfiable(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    session = StubSession()
+    monkeypatch.setattr(_common, "download_session", lambda: session)
+    filepath = tmp_path / "ota.zip"
+    filepath.write_bytes(content)
+
+    sha1_digest = download_url_to_file("https://example.com/ota.zip", filepath, resume=True)
+
+    assert filepath.read_bytes() == content
+    assert sha1_digest == hashlib.sha1(content).hexdigest()
+
+
+def test_try_download_url_to_file_gives_up_on_persistent_error(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    session = StubSession(status_code=404)
+    monkeypatch.setattr(_common, "download_session", lambda: session)
+    filepath = tmp_path / "ota.zip"
+
+    assert try_download_url_to_file("https://example.com/ota.zip", filepath) is None
+    assert not filepath.exists()
+
+
+class StubIpswStorage:
+    def __init__(self, local_dir: Path, artifact: IpswArtifact) -> None:
+        self.local_dir = local_dir
+        self.artifact = artifact
+        self.stored: list[IpswArtifact] = []
+
+    def artifact_iter(self, _filter: object) -> list[IpswArtifact]:
+        return [self.artifact]
+
+    def update_meta_item(self, artifact: IpswArtifact) -> None:
+        self.stored.append(artifact.model_copy(deep=True))
+
+
+@pytest.mark.parametrize(
+    "hashes, size",
+    [
+        (IpswArtifactHashes.model_validate({"sha1": hashlib.sha1(content).hexdigest()}), None),
+        (None, len(content)),
+        (None, None),
+    ],
+)
+def test_ipsw_mirror_marks_dead_link_as_failed(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, hashes: IpswArtifactHashes | None, size: int | None
+) -> None:
+    session = StubSession(status_code=404)
+    monkeypatch.setattr(_common, "download_session", lambda: session)
+    artifact = IpswArtifact(
+        platform=IpswPlatform.IOS,
+        version="17.2.1",
+        build="21C66",
+        release_status=IpswReleaseStatus.RELEASE,
+        sources=[
+            IpswSource.model_validate(
+                {
+                    "devices": ["iPhone11,2"],
+                    "link": "https://example.com/iPhone_17.2.1_21C66_Restore.ipsw",
+                    "hashes": hashes,
+                    "size": size,
+                }
+            )
+        ],
+    )
+    storage = StubIpswStorage(tmp_path, artifact)
+
+    runners.mirror(storage, datetime.timedelta(minutes=5))  # type: ignore[arg-type]
+
+    assert len(storage.stored) == 1
+    assert storage.stored[0].sources[0].processing_state == ArtifactProcessingState.MIRRORING_FAILED
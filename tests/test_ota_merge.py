@@ -1,5 +1,7 @@
+import dataclasses
+
 from symx._common import ArtifactProcessingState
-from symx._ota import generate_duplicate_key_from, OtaArtifact
+from symx._ota import generate_duplicate_key_from, merge_meta_data, OtaArtifact, OtaMetaData
 
 duplicate_value = OtaArtifact(
     build="21C66",
@@ -37,3 +39,26 @@ def test_generate_duplicate_key_from_with_existing_duplicate() -> None:
 
     duplicate_key = generate_duplicate_key_from(meta_store, their_key)
     assert duplicate_key == f"{their_key}_duplicate_3"
+
+
+def test_merge_meta_data_marks_new_release_duplicates() -> None:
+    our_key = "387534500408f0c0867b48bef124a1e581b12ed0"
+    ours: OtaMetaData = {our_key: dataclasses.replace(duplicate_value)}
+    release_key = "a5a0e1c7b7c7b5d2f0d5c1e27d26b8a7f1e0b3d9"
+    other_key = "0c6a2c5d4e9b1f8a7d3e2b1c0a9f8e7d6c5b4a39"
+    theirs: OtaMetaData = {
+        # same hash, platform and version as ours, but a different build
+        release_key: dataclasses.replace(
+            duplicate_value, id=release_key, build="21C67", processing_state=ArtifactProcessingState.INDEXED
+        ),
+        # a different hash is a separate artifact
+        other_key: dataclasses.replace(
+            duplicate_value, id=other_key, hash="1b6a4c", processing_state=ArtifactProcessingState.INDEXED
+        ),
+    }
+
+    merge_meta_data(ours, theirs)
+
+    assert ours[our_key].processing_state == ArtifactProcessingState.SYMBOLS_EXTRACTED
+    assert ours[release_key].processing_state == ArtifactProcessingState.INDEXED_DUPLICATE
+    assert ours[other_key].processing_state == ArtifactProcessingState.INDEXED
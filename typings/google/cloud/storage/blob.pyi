@@ -686,22 +686,7 @@ class Blob(_PropertyMixin):
         """
         ...
 
-    def download_as_bytes(
-        self,
-        client=...,
-        start=...,
-        end=...,
-        raw_download=...,
-        if_etag_match=...,
-        if_etag_not_match=...,
-        if_generation_match=...,
-        if_generation_not_match=...,
-        if_metageneration_match=...,
-        if_metageneration_not_match=...,
-        timeout=...,
-        checksum=...,
-        retry=...,
-    ):
+    def download_as_bytes(self) -> bytes:
         """Download the contents of this blob as a bytes object.
 
         If :attr:`user_project` is set on the bucket, bills the API request
@@ -1126,7 +1111,12 @@ class Blob(_PropertyMixin):
         ...
 
     def upload_from_filename(
-        self, filename: str, num_retries: int = ..., timeout: int = ..., if_generation_match: int | None = ...
+        self,
+        filename: str,
+        num_retries: int = ...,
+        timeout: int = ...,
+        if_generation_match: int | None = ...,
+        checksum: str | None = ...,
     ) -> None:
         """Upload this blob's contents from the content of a named file.
 
@@ -1250,7 +1240,7 @@ class Blob(_PropertyMixin):
         retry: Retry = ...,
         soft_deleted: bool | None = ...,
     ) -> None: ...
-    def upload_from_string(self, data: str, if_generation_match: int) -> None:
+    def upload_from_string(self, data: bytes | str, if_generation_match: int) -> None:
         """Upload contents of this blob from the provided string.
 
         .. note::
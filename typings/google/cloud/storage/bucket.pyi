@@ -633,23 +633,7 @@ class Bucket(_PropertyMixin):
         """The URL path to this bucket."""
         ...
 
-    def get_blob(
-        self,
-        blob_name,
-        client=...,
-        encryption_key=...,
-        generation=...,
-        if_etag_match=...,
-        if_etag_not_match=...,
-        if_generation_match=...,
-        if_generation_not_match=...,
-        if_metageneration_match=...,
-        if_metageneration_not_match=...,
-        timeout=...,
-        retry=...,
-        soft_deleted=...,
-        **kwargs,
-    ):
+    def get_blob(self, blob_name: str) -> Blob | None:
         """Get a blob object by name.
 
         See a [code sample](https://cloud.google.com/storage/docs/samples/storage-get-metadata#storage_get_metadata-python)
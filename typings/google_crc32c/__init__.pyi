@@ -0,0 +1,45 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+implementation: str = ...
+
+class Checksum:
+    """Hashlib-alike helper for CRC32C operations.
+
+    Args:
+        initial_value (Optional[bytes]): the initial chunk of data from
+            which the CRC32C checksum is computed.  Defaults to b''.
+    """
+
+    def __init__(self, initial_value: bytes = ...) -> None: ...
+    def update(self, chunk: bytes) -> None:
+        """Update the checksum with a new chunk of data.
+
+        Args:
+            chunk (Optional[bytes]): a chunk of data used to extend
+                the CRC32C checksum.
+        """
+        ...
+
+    def digest(self) -> bytes:
+        """Big-endian order, per RFC 4960.
+
+        See: https://cloud.google.com/storage/docs/json_api/v1/objects#crc32c
+
+        Returns:
+            bytes: A four-byte digest string.
+        """
+        ...
+
+    def hexdigest(self) -> bytes:
+        """Like :meth:`digest` except returns as a bytestring of double length.
+
+        Returns
+            bytes: A sixteen byte digest string, containing only hex digits.
+        """
+        ...
+
+def value(chunk: bytes) -> int:
+    """Compute CRC32C checksum for a chunk of data."""
+    ...